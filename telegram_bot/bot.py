@@ -1,9 +1,20 @@
 import os
+import asyncio
 import logging
-import requests
+import httpx
 import io
+import time
+import aiosqlite
+from urllib.parse import urlparse
+from cachetools import LRUCache, TTLCache
+try:
+    # orjson decodes JSON much faster than the standard library
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 from telegram import Update, InputFile
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.error import BadRequest
+from telegram.ext import AIORateLimiter, Application, CommandHandler, MessageHandler, filters, ContextTypes
 
 # --- Moved logger initialization ---
 # Setting up logging
@@ -12,27 +23,55 @@ logger = logging.getLogger(__name__)
 # --- End of moved block ---
 
 # --- Loading environment variables from .env file ---
-try:
-    from dotenv import load_dotenv
-    # Try to load variables from .env file
-    # Check several possible paths to .env file
-    possible_paths = [
-        './.env', 
-        '../.env', 
-        '../../.env',
-        '/app/.env'  # Typical path for Docker container
-    ]
-    
-    for env_path in possible_paths:
-        if os.path.exists(env_path):
-            logger.info(f"Loading environment variables from {env_path}")
-            load_dotenv(env_path)
-            break
-except ImportError:
-    logger.warning("The dotenv library is not installed. Skipping loading variables from .env file.")
+# Possible paths to .env file, the first existing one is used
+POSSIBLE_ENV_PATHS = (
+    './.env', 
+    '../.env', 
+    '../../.env',
+    '/app/.env'  # Typical path for Docker container
+)
+
+# Containers usually inject variables directly, then there is nothing to look for
+ENV_PATH = None
+if not os.getenv("TELEGRAM_BOT_TOKEN"):
+    ENV_PATH = next((p for p in POSSIBLE_ENV_PATHS if os.path.exists(p)), None)
+
+if ENV_PATH:
+    try:
+        from dotenv import load_dotenv
+        logger.info(f"Loading environment variables from {ENV_PATH}")
+        load_dotenv(ENV_PATH)
+    except ImportError:
+        logger.warning("The dotenv library is not installed. Skipping loading variables from .env file.")
+
+# Shared HTTP client for every upstream host (API service, Unsplash, audio CDN):
+# connections are kept alive between requests and multiplexed over HTTP/2
+CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=httpx.Timeout(10.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=60)
+)
+
+# In-process caches for repeated lookups of the same words
+DEF_CACHE = TTLCache(maxsize=10_000, ttl=86400)     # word -> parsed dictionary entry (1 day)
+IMG_CACHE = TTLCache(maxsize=10_000, ttl=604800)    # word -> Unsplash image info (1 week)
+BYTES_CACHE = LRUCache(maxsize=500)                 # url -> downloaded audio/image content
+
+# JSON bodies larger than this are decoded in a worker thread
+LARGE_JSON_SIZE = 64 * 1024
+
+async def _decode(body):
+    """Decodes a JSON body, off the event loop thread if it is large."""
+    if len(body) > LARGE_JSON_SIZE:
+        return await asyncio.to_thread(json_loads, body)
+    return json_loads(body)
+
+# Telegram file_id of every audio/image already uploaded, keyed by source URL.
+# Sending a file_id again makes Telegram reuse the file without any upload.
+FILE_ID_CACHE: dict[str, str] = {}
 
 # --- Built-in functions from pict.py ---
-def fetch_unsplash_images(query, num=1, access_key=None):
+async def fetch_unsplash_images(query, num=1, access_key=None):
     """Searches for images on Unsplash and returns a list of tuples (url, photographer, image id)."""
     if not access_key:
         logger.warning("Error: Unsplash access key not provided.")
@@ -50,9 +89,9 @@ def fetch_unsplash_images(query, num=1, access_key=None):
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10)
+        response = await CLIENT.get(url, headers=headers, params=params)
         response.raise_for_status() 
-        data = response.json()
+        data = await _decode(response.content)
         
         if "results" in data and data["results"]:
             # Return tuples (url, photographer_name, photographer_username, photo_id)
@@ -67,14 +106,14 @@ def fetch_unsplash_images(query, num=1, access_key=None):
             logger.info(f"Unsplash: no images found for '{query}'.")
             return []
              
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Unsplash API request error: {e}")
         return []
     except Exception as e: 
         logger.error(f"Unexpected error during Unsplash request: {e}")
         return []
 
-def trigger_unsplash_download(photo_id, access_key=None):
+async def trigger_unsplash_download(photo_id, access_key=None):
     """Sends a request to Unsplash API to register a download (Unsplash requirement)."""
     if not access_key or not photo_id:
         return False
@@ -84,26 +123,48 @@ def trigger_unsplash_download(photo_id, access_key=None):
         headers = {
             "Authorization": f"Client-ID {access_key}"
         }
-        response = requests.get(download_url, headers=headers, timeout=5)
+        response = await CLIENT.get(download_url, headers=headers, timeout=5)
         response.raise_for_status()
         logger.info(f"Successfully sent download request for photo ID: {photo_id}")
         return True
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error registering Unsplash download: {e}")
         return False
 
-def download_image_data(image_url):
+async def download_image_data(image_url):
     """Downloads an image by URL and returns its content (bytes)."""
+    image_data = BYTES_CACHE.get(image_url)
+    if image_data is not None:
+        return image_data
     try:
-        img_response = requests.get(image_url, stream=True, timeout=15)
+        img_response = await CLIENT.get(image_url, timeout=15, follow_redirects=True)
         img_response.raise_for_status() 
+        BYTES_CACHE[image_url] = img_response.content
         return img_response.content
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Error downloading image {image_url}: {e}")
         return None
     except Exception as e:
         logger.error(f"Unexpected error downloading image {image_url}: {e}")
         return None
+
+async def fetch_illustration(query, access_key=None):
+    """Finds an image on Unsplash. Returns image info (url, photographer, username, photo id) or None."""
+    image_info = IMG_CACHE.get(query)
+    if image_info is None:
+        image_info = await db_get_unsplash(query)
+        if image_info is None:
+            image_results = await fetch_unsplash_images(query, num=1, access_key=access_key)
+            if not image_results:
+                logger.info(f"No images found for '{query}' on Unsplash.")
+                return None
+            image_info = image_results[0]
+            await db_put_unsplash(query, image_info)
+        # Only set on a miss: re-setting a TTLCache key would reset its expiry
+        IMG_CACHE[query] = image_info
+
+    logger.info(f"Image found: {image_info[0]}. Photographer: {image_info[1]}.")
+    return image_info
 # --- End of built-in functions ---
 
 # Getting environment variables
@@ -111,11 +172,18 @@ TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 API_HOST = os.getenv("API_HOST", "cambridge-api")
 API_PORT = os.getenv("API_PORT", "8000")
 UNSPLASH_ACCESS_KEY = os.getenv("UNSPLASH_ACCESS_KEY")
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "cache.db")
+# Public HTTPS URL for webhook mode (behind a TLS reverse proxy); polling is used when not set
+WEBHOOK_URL = os.getenv("WEBHOOK_URL") or None
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET") or None
 
 # Logging variable values (without token, for security)
 logger.info(f"API_HOST: {API_HOST}")
 logger.info(f"API_PORT: {API_PORT}")
 logger.info(f"UNSPLASH_ACCESS_KEY set: {'Yes' if UNSPLASH_ACCESS_KEY else 'No'}")
+logger.info(f"CACHE_DB_PATH: {CACHE_DB_PATH}")
+logger.info(f"Update mode: {'webhook ' + WEBHOOK_URL if WEBHOOK_URL else 'polling'}")
 
 # Check for required keys
 if not TELEGRAM_BOT_TOKEN:
@@ -129,6 +197,155 @@ API_URL = f"http://{API_HOST}:{API_PORT}"
 # Maximum message length in Telegram
 MAX_MESSAGE_LENGTH = 4000  # Leaving some buffer for safety (actual limit is 4096)
 
+# Display labels for pronunciation languages, others are shown upper-cased
+LANG_LABELS = {"uk": "🇬🇧 UK", "us": "🇺🇸 US"}
+
+# Caption templates, filled with str.format_map
+UK_AUDIO_TEMPLATE = "🇬🇧 British pronunciation of the word '{word}'"
+US_AUDIO_TEMPLATE = "🇺🇸 American pronunciation of the word '{word}'"
+ATTR_TEMPLATE = (
+    "🖼️ Illustration for the word '{word_cap}'\n"
+    "Photo by [{name}]({purl}) on [Unsplash]({uurl})"
+)
+
+# Referral parameters required by Unsplash attribution guidelines
+UTM_SUFFIX = "?utm_source=dictionary_bot&utm_medium=referral"
+UNSPLASH_URL = "https://unsplash.com/" + UTM_SUFFIX
+
+# Fragments of Telegram BadRequest messages meaning it could not use the photo URL or file_id
+PHOTO_SOURCE_ERRORS = (
+    "http url",            # "Wrong file identifier/http url specified", "Failed to get http url content"
+    "file identifier",     # "Wrong remote file identifier specified"
+    "web page content",    # "Wrong type of the web page content"
+    "wrong padding",       # Malformed file_id
+)
+
+# --- Persistent cache (SQLite), survives bot restarts ---
+CACHE_DB_TTL = 86400  # Definitions and Unsplash results older than a day are fetched again
+
+# Shared database connection, opened in post_init and closed in post_shutdown.
+# Stays None if the database could not be opened, then only memory caches are used.
+CACHE_DB = None
+
+async def init_cache_db():
+    """Opens the cache database, creates tables and loads known Telegram file_ids into memory."""
+    global CACHE_DB
+    try:
+        CACHE_DB = await aiosqlite.connect(CACHE_DB_PATH)
+        await CACHE_DB.execute(
+            "CREATE TABLE IF NOT EXISTS definitions ("
+            "word TEXT PRIMARY KEY, json BLOB, fetched_at INTEGER)"
+        )
+        await CACHE_DB.execute(
+            "CREATE TABLE IF NOT EXISTS unsplash ("
+            "word TEXT PRIMARY KEY, url TEXT, photographer TEXT, username TEXT, "
+            "photo_id TEXT, fetched_at INTEGER)"
+        )
+        await CACHE_DB.execute(
+            "CREATE TABLE IF NOT EXISTS telegram_files ("
+            "src_url TEXT PRIMARY KEY, file_id TEXT, kind TEXT)"
+        )
+        await CACHE_DB.commit()
+        
+        async with CACHE_DB.execute("SELECT src_url, file_id FROM telegram_files") as cursor:
+            async for src_url, file_id in cursor:
+                FILE_ID_CACHE[src_url] = file_id
+        logger.info(f"Cache database ready, {len(FILE_ID_CACHE)} Telegram file_ids loaded.")
+    except aiosqlite.Error as e:
+        logger.error(f"Error initializing cache database {CACHE_DB_PATH}: {e}")
+        await close_cache_db()
+
+async def close_cache_db():
+    """Closes the shared cache database connection."""
+    global CACHE_DB
+    if CACHE_DB is not None:
+        await CACHE_DB.close()
+        CACHE_DB = None
+
+async def db_get_definition(word):
+    """Returns the stored dictionary entry for the word if it is fresh enough, else None."""
+    if CACHE_DB is None:
+        return None
+    try:
+        async with CACHE_DB.execute(
+            "SELECT json FROM definitions WHERE word = ? AND fetched_at > ?",
+            (word, int(time.time()) - CACHE_DB_TTL)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return await _decode(row[0]) if row else None
+    except aiosqlite.Error as e:
+        logger.error(f"Error reading cached definition for '{word}': {e}")
+        return None
+
+async def db_put_definition(word, body):
+    """Stores the raw JSON body of a dictionary entry."""
+    if CACHE_DB is None:
+        return
+    try:
+        await CACHE_DB.execute(
+            "INSERT OR REPLACE INTO definitions (word, json, fetched_at) VALUES (?, ?, ?)",
+            (word, body, int(time.time()))
+        )
+        await CACHE_DB.commit()
+    except aiosqlite.Error as e:
+        logger.error(f"Error caching definition for '{word}': {e}")
+
+async def db_get_unsplash(word):
+    """Returns stored Unsplash image info (url, photographer, username, photo id) or None."""
+    if CACHE_DB is None:
+        return None
+    try:
+        async with CACHE_DB.execute(
+            "SELECT url, photographer, username, photo_id FROM unsplash "
+            "WHERE word = ? AND fetched_at > ?",
+            (word, int(time.time()) - CACHE_DB_TTL)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return tuple(row) if row else None
+    except aiosqlite.Error as e:
+        logger.error(f"Error reading cached Unsplash image for '{word}': {e}")
+        return None
+
+async def db_put_unsplash(word, image_info):
+    """Stores Unsplash image info for the word."""
+    if CACHE_DB is None:
+        return
+    try:
+        await CACHE_DB.execute(
+            "INSERT OR REPLACE INTO unsplash "
+            "(word, url, photographer, username, photo_id, fetched_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (word, *image_info, int(time.time()))
+        )
+        await CACHE_DB.commit()
+    except aiosqlite.Error as e:
+        logger.error(f"Error caching Unsplash image for '{word}': {e}")
+
+async def remember_file_id(src_url, file_id, kind):
+    """Remembers the Telegram file_id of an uploaded file in memory and in the database."""
+    FILE_ID_CACHE[src_url] = file_id
+    if CACHE_DB is None:
+        return
+    try:
+        await CACHE_DB.execute(
+            "INSERT OR REPLACE INTO telegram_files (src_url, file_id, kind) VALUES (?, ?, ?)",
+            (src_url, file_id, kind)
+        )
+        await CACHE_DB.commit()
+    except aiosqlite.Error as e:
+        logger.error(f"Error caching Telegram file_id for {src_url}: {e}")
+
+async def forget_file_id(src_url):
+    """Drops a Telegram file_id that no longer works (e.g. after the bot token changed)."""
+    FILE_ID_CACHE.pop(src_url, None)
+    if CACHE_DB is None:
+        return
+    try:
+        await CACHE_DB.execute("DELETE FROM telegram_files WHERE src_url = ?", (src_url,))
+        await CACHE_DB.commit()
+    except aiosqlite.Error as e:
+        logger.error(f"Error removing Telegram file_id for {src_url}: {e}")
+# --- End of persistent cache ---
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Sends a welcome message when the /start command is used."""
     await update.message.reply_text(
@@ -148,68 +365,193 @@ def split_message(text, max_length=MAX_MESSAGE_LENGTH):
         return [text]
     
     parts = []
-    current_part = ""
+    buf = []      # pieces of the current part, joined once when the part is full
+    buf_len = 0
     
-    # Split text by paragraphs for more natural division
-    paragraphs = text.split('\n\n')
+    def add(sep, piece):
+        nonlocal buf, buf_len
+        # A buffer holding only empty pieces counts as fresh: no separator in front
+        if buf_len == 0:
+            buf = [piece]
+            buf_len = len(piece)
+        elif buf_len + len(sep) + len(piece) > max_length:
+            parts.append(''.join(buf))
+            buf = [piece]
+            buf_len = len(piece)
+        else:
+            buf.append(sep)
+            buf.append(piece)
+            buf_len += len(sep) + len(piece)
     
-    for paragraph in paragraphs:
+    # Split text by paragraphs for more natural division
+    for paragraph in text.split('\n\n'):
+        if len(paragraph) <= max_length:
+            add('\n\n', paragraph)
+            continue
+        
         # If paragraph itself is too long, split it by lines
-        if len(paragraph) > max_length:
-            lines = paragraph.split('\n')
-            for line in lines:
-                # If even one line is too long, split it into parts
-                if len(line) > max_length:
-                    for i in range(0, len(line), max_length):
-                        chunk = line[i:i+max_length]
-                        if len(current_part + chunk) > max_length:
-                            parts.append(current_part)
-                            current_part = chunk
-                        else:
-                            current_part += chunk
-                else:
-                    if len(current_part + '\n' + line) > max_length:
-                        parts.append(current_part)
-                        current_part = line
-                    else:
-                        current_part = current_part + '\n' + line if current_part else line
-        else:
-            if len(current_part + '\n\n' + paragraph) > max_length:
-                parts.append(current_part)
-                current_part = paragraph
-            else:
-                current_part = current_part + '\n\n' + paragraph if current_part else paragraph
+        for line in paragraph.split('\n'):
+            if len(line) <= max_length:
+                add('\n', line)
+                continue
+            
+            # If even one line is too long, split it into fixed-size chunks
+            for i in range(0, len(line), max_length):
+                add('', line[i:i + max_length])
     
-    if current_part:
-        parts.append(current_part)
+    if buf_len:
+        parts.append(''.join(buf))
     
     return parts
 
-async def download_and_send_audio(update, audio_url, caption="", voice_type="US"):
-    """Downloads audio by URL and sends it to the chat."""
+async def fetch_definition(word):
+    """Requests the word from the API service, caching successful results."""
+    data = DEF_CACHE.get(word)
+    if data is not None:
+        return data
+    
+    data = await db_get_definition(word)
+    if data is not None:
+        DEF_CACHE[word] = data
+        return data
+    
+    response = await CLIENT.get(f"{API_URL}/search/{word}")
+    response.raise_for_status()
+    data = await _decode(response.content)
+    
+    if "error" not in data:
+        DEF_CACHE[word] = data
+        await db_put_definition(word, response.content)
+    return data
+
+async def fetch_audio(audio_url):
+    """Downloads audio by URL and returns its content (bytes), or a Telegram file_id if already uploaded."""
+    if audio_url in FILE_ID_CACHE:
+        return FILE_ID_CACHE[audio_url]
+    audio_bytes = BYTES_CACHE.get(audio_url)
+    if audio_bytes is not None:
+        return audio_bytes
     try:
-        response = requests.get(
+        # Stream the body straight into one buffer instead of keeping
+        # the response content and a BytesIO copy of it
+        buf = bytearray()
+        async with CLIENT.stream(
+            "GET",
             audio_url, 
-            stream=True,
             headers={"User-Agent": "Mozilla/5.0"},  # Adding header
-            verify=False  # Disabling SSL verification
-        )
-        response.raise_for_status()
-        
-        audio_data = io.BytesIO(response.content)
-        audio_data.name = f"pronunciation_{voice_type}.mp3"
+            follow_redirects=True
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(65536):
+                buf.extend(chunk)
+        audio_bytes = BYTES_CACHE[audio_url] = bytes(buf)
+        return audio_bytes
+    except Exception as e:
+        logger.error(f"Error downloading audio {audio_url}: {e}")
+        return None
+
+async def send_audio(update, audio_url, audio, caption="", voice_type="US"):
+    """Sends downloaded audio (bytes or Telegram file_id) to the chat."""
+    try:
+        if isinstance(audio, str):
+            # Already uploaded once, Telegram can reuse the file by its id
+            try:
+                await update.message.reply_voice(voice=audio, caption=caption)
+                return True
+            except BadRequest as e:
+                # file_ids belong to one bot, a stored one may be unusable now
+                logger.warning(f"Telegram rejected cached file_id for {audio_url} ({e}), uploading it again...")
+                await forget_file_id(audio_url)
+                audio = await fetch_audio(audio_url)
+                if audio is None:
+                    return False
         
         # Send audio
-        await update.message.reply_voice(
-            voice=audio_data, 
-            caption=caption,
-            filename=audio_data.name
+        msg = await update.message.reply_voice(
+            voice=InputFile(audio, filename=f"pronunciation_{voice_type}.mp3"), 
+            caption=caption
         )
+        await remember_file_id(audio_url, msg.voice.file_id, "voice")
         return True
     except Exception as e:
-        logger.error(f"Error downloading/sending audio: {e}")
+        logger.error(f"Error sending audio: {e}")
         return False
 
+async def send_illustration(update, word, illustration):
+    """Sends the Unsplash image with attribution and registers the download."""
+    # Unpack photo information
+    image_url, photographer_name, photographer_username, photo_id = illustration
+    try:
+        # Create proper attribution according to Unsplash requirements
+        attribution = ATTR_TEMPLATE.format_map({
+            "word_cap": word.capitalize(),
+            "name": photographer_name,
+            "purl": "https://unsplash.com/@" + photographer_username + UTM_SUFFIX,
+            "uurl": UNSPLASH_URL
+        })
+        
+        try:
+            # Telegram fetches the image by URL itself (or reuses a file_id it already has)
+            msg = await update.message.reply_photo(
+                photo=FILE_ID_CACHE.get(image_url, image_url), 
+                caption=attribution,
+                parse_mode="Markdown"
+            )
+        except BadRequest as e:
+            # Other errors (e.g. caption Markdown) would fail the upload the same way
+            if not any(marker in e.message.lower() for marker in PHOTO_SOURCE_ERRORS):
+                raise
+            logger.warning(f"Telegram could not fetch image {image_url} ({e}), uploading it instead...")
+            image_data = await download_image_data(image_url)
+            if not image_data:
+                logger.warning(f"Failed to download image data for '{word}' from URL: {image_url}")
+                return False
+            
+            image_bytes_io = io.BytesIO(image_data)
+            image_bytes_io.name = f"{word}_unsplash.jpg"
+            msg = await update.message.reply_photo(
+                photo=image_bytes_io, 
+                caption=attribution,
+                parse_mode="Markdown"
+            )
+        # Skip the database write when the photo was sent by its known file_id
+        file_id = msg.photo[-1].file_id
+        if file_id != FILE_ID_CACHE.get(image_url):
+            await remember_file_id(image_url, file_id, "photo")
+        logger.info(f"Image for '{word}' successfully sent.")
+        
+        # Register photo usage according to Unsplash API
+        await trigger_unsplash_download(photo_id, UNSPLASH_ACCESS_KEY)
+        return True
+    except Exception as e:
+        logger.error(f"Error sending photo for '{word}': {e}", exc_info=True)
+        return False
+
+def _format_definition(i, definition):
+    """Formats one numbered definition with its translation and examples."""
+    def_pos = definition.get('pos')
+    translation = definition.get('translation')
+    ex_list = definition.get('example') or []
+    
+    pos = f" ({def_pos})" if def_pos else ""
+    out = [f"{i}.{pos} {definition['text']}\n"]
+    
+    # If translation exists
+    if translation:
+        out.append(f"   _Translation:_ {translation}\n")
+    
+    # If examples exist
+    if ex_list:
+        out.append("   _Examples:_\n")
+        for ex in ex_list[:3]:
+            out.append(f"   • {ex['text']}\n")
+            ex_translation = ex.get('translation')
+            if ex_translation:
+                out.append(f"     {ex_translation}\n")
+        out.append("\n")
+    
+    return "".join(out)
+
 async def search_word(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Search for word definition through API service and send image."""
     word = update.message.text.strip().lower()
@@ -220,57 +562,75 @@ async def search_word(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
     
     await update.message.reply_text(f"Looking up the definition for '{word}'...")
     
+    # Background downloads started below, cancelled if we leave before awaiting them
+    tasks = []
     try:
-        response = requests.get(f"{API_URL}/search/{word}", timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_definition(word)
         
         if "error" in data:
             await update.message.reply_text(f"Error: {data['error']}")
             return
         
+        poses = data.get("pos") or []
+        prons = data.get("pronunciation") or []
+        defs = data.get("definition") or []
+        
+        # Start the image search right away, it does not depend on the text below
+        if UNSPLASH_ACCESS_KEY:
+            logger.info(f"Searching for an image for '{word}' on Unsplash...")
+            image_task = asyncio.create_task(fetch_illustration(word, access_key=UNSPLASH_ACCESS_KEY))
+            tasks.append(image_task)
+        else:
+            logger.debug("UNSPLASH_ACCESS_KEY not configured, skipping image search.")
+            image_task = None
+        
+        # One pass over pronunciations: drop duplicates, remember the first entry per language
+        pron_by_lang = {}
+        pron_lines = []
+        if prons:
+            seen = set()
+            for pron in prons:
+                key = (pron['lang'], pron['pron'])
+                if key in seen:
+                    continue
+                seen.add(key)
+                pron_by_lang.setdefault(pron['lang'], pron)
+                lang_label = LANG_LABELS.get(pron['lang'], pron['lang'].upper())
+                pron_lines.append(f"{lang_label}: {pron['pron']}\n")
+        
+        # Start audio downloads as well
+        uk_pron = pron_by_lang.get("uk")
+        us_pron = pron_by_lang.get("us")
+        uk_task = us_task = None
+        if uk_pron:
+            uk_task = asyncio.create_task(fetch_audio(uk_pron["url"]))
+            tasks.append(uk_task)
+        if us_pron and (not uk_pron or us_pron["url"] != uk_pron["url"]):
+            us_task = asyncio.create_task(fetch_audio(us_pron["url"]))
+            tasks.append(us_task)
+        
         # Format the main message
-        result = f"📚 *{data['word'].capitalize()}*\n\n"
+        out = [f"📚 *{data['word'].capitalize()}*\n\n"]
         
         # Format parts of speech
-        if "pos" in data and data["pos"]:
-            result += f"🔤 *Part of speech:* {', '.join(data['pos'])}\n\n"
+        if poses:
+            out.append(f"🔤 *Part of speech:* {', '.join(poses)}\n\n")
         
         # Pronunciation
-        if "pronunciation" in data and data["pronunciation"]:
-            result += "*Pronunciation:*\n"
-            unique_prons = {}
-            for pron in data["pronunciation"]:
-                key = f"{pron['lang']}-{pron['pron']}"
-                if key not in unique_prons:
-                    unique_prons[key] = pron
-            
-            for key, pron in unique_prons.items():
-                lang_label = "🇬🇧 UK" if pron['lang'] == 'uk' else "🇺🇸 US" if pron['lang'] == 'us' else pron['lang'].upper()
-                result += f"{lang_label}: {pron['pron']}\n"
-            result += "\n"
+        if pron_lines:
+            out.append("*Pronunciation:*\n")
+            out.extend(pron_lines)
+            out.append("\n")
         
         # Definitions
-        if "definition" in data and data["definition"]:
-            result += "*Definitions:*\n"
-            for i, definition in enumerate(data["definition"], 1):
-                pos = f" ({definition['pos']})" if 'pos' in definition and definition['pos'] else ""
-                result += f"{i}.{pos} {definition['text']}\n"
-                
-                # If translation exists
-                if "translation" in definition and definition["translation"]:
-                    result += f"   _Translation:_ {definition['translation']}\n"
-                
-                # If examples exist
-                if "example" in definition and definition["example"]:
-                    result += "   _Examples:_\n"
-                    for ex in definition["example"][:3]:
-                        result += f"   • {ex['text']}\n"
-                        if 'translation' in ex and ex['translation']:
-                            result += f"     {ex['translation']}\n"
-                    result += "\n"
+        if defs:
+            out.append("*Definitions:*\n")
+            for i, definition in enumerate(defs, 1):
+                out.append(_format_definition(i, definition))
         else:
-            result += "No definitions found.\n"
+            out.append("No definitions found.\n")
+        
+        result = "".join(out)
         
         # Split the final message into parts and send
         message_parts = split_message(result)
@@ -283,92 +643,101 @@ async def search_word(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
                 # Subsequent parts with indication that this is a continuation
                 await update.message.reply_text(f"(Continued {i+1}/{len(message_parts)})\n\n{part}", parse_mode="Markdown")
         
-        # Send audio if available
-        uk_pron_sent = False
-        us_pron_sent = False
-        if "pronunciation" in data and data["pronunciation"]:
-            uk_pron = next((p for p in data["pronunciation"] if p["lang"] == "uk"), None)
-            us_pron = next((p for p in data["pronunciation"] if p["lang"] == "us"), None)
-            
-            if uk_pron:
-                uk_pron_sent = await download_and_send_audio(
-                    update, 
-                    uk_pron["url"], 
-                    f"🇬🇧 British pronunciation of the word '{data['word']}'",
-                    "UK"
-                )
-            
-            if us_pron and (not uk_pron or us_pron["url"] != uk_pron["url"]):
-                us_pron_sent = await download_and_send_audio(
-                    update, 
-                    us_pron["url"], 
-                    f"🇺🇸 American pronunciation of the word '{data['word']}'",
-                    "US"
-                )
-
-        # --- Modified block for searching and sending images ---
-        if UNSPLASH_ACCESS_KEY:
-            logger.info(f"Searching for an image for '{word}' on Unsplash...")
-            image_results = fetch_unsplash_images(word, num=1, access_key=UNSPLASH_ACCESS_KEY)
-
-            if image_results:
-                # Unpack photo information
-                image_url, photographer_name, photographer_username, photo_id = image_results[0]
-                logger.info(f"Image found: {image_url}. Photographer: {photographer_name}. Downloading...")
-                image_data = download_image_data(image_url)
-
-                if image_data:
-                    try:
-                        image_bytes_io = io.BytesIO(image_data)
-                        image_bytes_io.name = f"{word}_unsplash.jpg"
-                        
-                        # Create proper attribution according to Unsplash requirements
-                        photographer_url = f"https://unsplash.com/@{photographer_username}?utm_source=dictionary_bot&utm_medium=referral"
-                        unsplash_url = "https://unsplash.com/?utm_source=dictionary_bot&utm_medium=referral"
-                        
-                        # Change attribution format to English with clickable links
-                        attribution = (
-                            f"🖼️ Illustration for the word '{word.capitalize()}'\n"
-                            f"Photo by [{photographer_name}]({photographer_url}) on [Unsplash]({unsplash_url})"
-                        )
-                        
-                        await update.message.reply_photo(
-                            photo=image_bytes_io, 
-                            caption=attribution,
-                            parse_mode="Markdown"
-                        )
-                        logger.info(f"Image for '{word}' successfully sent.")
-                        
-                        # Register photo usage according to Unsplash API
-                        trigger_unsplash_download(photo_id, UNSPLASH_ACCESS_KEY)
-                    except Exception as e:
-                        logger.error(f"Error sending photo for '{word}': {e}", exc_info=True)
-                else:
-                    logger.warning(f"Failed to download image data for '{word}' from URL: {image_url}")
-            else:
-                logger.info(f"No images found for '{word}' on Unsplash.")
-        else:
-            logger.debug("UNSPLASH_ACCESS_KEY not configured, skipping image search.")
-        # --- End of modified block ---
+        # Wait for the downloads started above
+        results = dict(zip(tasks, await asyncio.gather(*tasks, return_exceptions=True)))
+        
+        # Send audio and image in parallel, the rate limiter keeps us within Telegram limits
+        sends = []
+        uk_audio = results.get(uk_task)
+        if uk_audio and not isinstance(uk_audio, Exception):
+            sends.append(send_audio(
+                update, 
+                uk_pron["url"], 
+                uk_audio, 
+                UK_AUDIO_TEMPLATE.format_map(data),
+                "UK"
+            ))
+        
+        us_audio = results.get(us_task)
+        if us_audio and not isinstance(us_audio, Exception):
+            sends.append(send_audio(
+                update, 
+                us_pron["url"], 
+                us_audio, 
+                US_AUDIO_TEMPLATE.format_map(data),
+                "US"
+            ))
 
-    except requests.RequestException as e:
+        illustration = results.get(image_task)
+        if isinstance(illustration, Exception):
+            logger.error(f"Error searching image for '{word}': {illustration}")
+        elif illustration:
+            sends.append(send_illustration(update, word, illustration))
+        
+        await asyncio.gather(*sends)
+
+    except httpx.HTTPError as e:
         logger.error(f"Error while requesting API: {e}")
         await update.message.reply_text("Error connecting to dictionary service. Please try again later.")
     except Exception as e:
         logger.error(f"Unexpected error occurred while processing word '{word}': {e}", exc_info=True)
         await update.message.reply_text("An internal error occurred. Please try again later.")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+async def prewarm_connections():
+    """Opens connections to the upstream hosts so the first query skips the handshakes."""
+    urls = [API_URL]
+    if UNSPLASH_ACCESS_KEY:
+        urls.append("https://api.unsplash.com/")
+    results = await asyncio.gather(*(CLIENT.get(url) for url in urls), return_exceptions=True)
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Could not prewarm connection to {url}: {result}")
+
+async def post_init(application: Application) -> None:
+    """Prepares the persistent cache and connections before the bot starts handling updates."""
+    await asyncio.gather(init_cache_db(), prewarm_connections())
+
+async def post_shutdown(application: Application) -> None:
+    """Closes the shared HTTP client and cache database when the bot stops."""
+    await CLIENT.aclose()
+    await close_cache_db()
 
 def main() -> None:
     """Start the bot."""
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
+    logger.info(f"Starting bot from {os.path.abspath(__file__)}")
+    # Updates from different users are handled concurrently, the rate limiter
+    # keeps the bot within Telegram's flood limits
+    application = (
+        Application.builder()
+        .token(TELEGRAM_BOT_TOKEN)
+        .concurrent_updates(True)
+        .rate_limiter(AIORateLimiter(overall_max_rate=30, max_retries=3))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     # Register handlers
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, search_word))
+    application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, search_word, block=False))
 
     # Start the bot
-    application.run_polling()
+    if WEBHOOK_URL:
+        # Telegram pushes updates to us, no getUpdates polling loop
+        application.run_webhook(
+            listen="0.0.0.0",
+            port=WEBHOOK_PORT,
+            url_path=urlparse(WEBHOOK_URL).path.lstrip("/"),
+            webhook_url=WEBHOOK_URL,
+            secret_token=WEBHOOK_SECRET
+        )
+    else:
+        application.run_polling()
 
 if __name__ == "__main__":
     main()